@@ -1,8 +1,18 @@
+import http.client
 import re
 import time
 from abc import ABC, abstractmethod
-
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.request import Request, urlopen
+
+import lxml.etree
+import lxml.html
 from selenium import webdriver
+from selenium.common.exceptions import JavascriptException, TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -20,10 +30,23 @@ class BaseSiteScraper(ABC):
         self.driver = driver
         self.wait = wait
 
+    def _open(self, url: str) -> None:
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            # Keep whatever has loaded so far; the waits that follow validate it
+            self.driver.execute_script("window.stop();")
+
     @abstractmethod
-    def scrape(self, **kwargs) -> str:
+    def scrape(self, **kwargs) -> Iterator[str]:
+        """Scrape offers and return the merged HTML as an iterator of chunks."""
         pass
 
+    @classmethod
+    def scrape_static(cls, **kwargs) -> Iterator[str] | None:
+        """Scrape offers over plain HTTP, without a browser. None means a browser is required."""
+        return None
+
 
 class PracujPLITScraper(BaseSiteScraper):
     class City:
@@ -43,12 +66,120 @@ class PracujPLITScraper(BaseSiteScraper):
         MANAGER_C_LEVEL = "20%2C6"
 
     BASE_URL = "https://it.pracuj.pl/praca"
-
-    def _build_url(self, city: str, experience: str, with_salary: bool):
+    STATIC_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+        ),
+        "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+    }
+
+    @classmethod
+    def _build_url(cls, city: str, experience: str, with_salary: bool):
         salary_param = "&sal=1" if with_salary else ""
         experience_param = f"{"&" if city else "?"}et={experience}" if experience else ""
         city_param = f"/{city};wp?rd=30" if city else "?"
-        return f"{self.BASE_URL}{city_param}{experience_param}{salary_param}"
+        return f"{cls.BASE_URL}{city_param}{experience_param}{salary_param}"
+
+    @classmethod
+    def _static_fetch(cls, url: str, timeout: int = 10) -> str | None:
+        request = Request(url, headers=cls.STATIC_HEADERS)
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                charset = response.headers.get_content_charset() or "utf-8"
+                body = response.read()
+        except (OSError, http.client.HTTPException, ValueError):
+            # OSError covers URLError, timeouts and dropped connections
+            return None
+
+        try:
+            return body.decode(charset, errors="replace")
+        except LookupError:
+            # Unknown charset announced by the server
+            return body.decode("utf-8", errors="replace")
+
+    @classmethod
+    def _fetch_static_page(cls, url: str, attempts: int = 2) -> tuple[list[str], bool] | None:
+        """
+        Return the offer divs' HTML and whether a next-page button is present.
+        None means the page could not be fetched or parsed, as opposed to an
+        empty listing page.
+        """
+        page_html = None
+        for _ in range(attempts):
+            page_html = cls._static_fetch(url)
+            if page_html is not None:
+                break
+        if page_html is None:
+            return None
+
+        try:
+            document = lxml.html.fromstring(page_html)
+        except lxml.etree.ParserError:
+            return None
+
+        offer_divs = [
+            lxml.html.tostring(div, encoding="unicode", with_tail=False)
+            for div in document.xpath("//*[@data-test='section-offers']/div")
+        ]
+        has_next = bool(document.xpath("//*[@data-test='bottom-pagination-button-next']"))
+        return offer_divs, has_next
+
+    @staticmethod
+    def _add_new_offers(offers: Iterable[str], all_offers: list[str], seen_offers: set[str]) -> list[str]:
+        # Pages can overlap or be re-served from a stale cache; keep first copies only
+        page_offers: list[str] = []
+        for html in offers:
+            if html not in seen_offers:
+                seen_offers.add(html)
+                page_offers.append(html)
+        all_offers.extend(page_offers)
+        return page_offers
+
+    @classmethod
+    def scrape_static(
+        cls,
+        city: str,
+        experience: str,
+        with_salary: bool = True,
+        max_stale_rounds: int = 5,
+        max_rounds: int = 400,
+    ) -> Iterator[str] | None:
+        """
+        Scrape server-rendered listing pages, paginating with the pn URL param.
+
+        Returns None if any page cannot be fetched or the first page carries
+        no offers, so the caller can fall back to the browser instead of saving
+        a truncated listing. On later pages an empty page, or one without new
+        offers, marks the end of the listing.
+        """
+        url = cls._build_url(city, experience, with_salary)
+
+        all_offers: list[str] = []
+        seen_offers: set[str] = set()
+
+        for page in range(1, max_rounds + 1):
+            static_page = cls._fetch_static_page(f"{url}&pn={page}")
+            if static_page is None:
+                print(f"Page {page} (static): fetch failed - falling back to the browser")
+                return None
+
+            offer_divs, has_next = static_page
+            if not offer_divs:
+                if page == 1:
+                    return None
+                print(f"Page {page} (static): no offers - end of listing")
+                break
+
+            page_offers = cls._add_new_offers(offer_divs, all_offers, seen_offers)
+            print(f"Page {page} (static): collected {len(page_offers)} offers (total: {len(all_offers)})")
+
+            # The next button can stay in the markup (hidden) on the last page,
+            # so a page that repeats known offers also ends the listing.
+            if not page_offers or not has_next:
+                break
+
+        return chain(("<div>",), all_offers, ("</div>",))
 
     def _parse_total_offers(self) -> int:
         container = self.wait.until(
@@ -80,9 +211,13 @@ class PracujPLITScraper(BaseSiteScraper):
             return
 
     def _collect_offer_divs(self) -> list[str]:
-        section = self.driver.find_element(By.CSS_SELECTOR, "[data-test='section-offers']")
-        divs = section.find_elements(By.XPATH, "./div")
-        return [div.get_attribute("outerHTML") for div in divs]
+        return self.driver.execute_script(
+            """
+            return Array.from(
+                document.querySelectorAll("[data-test='section-offers'] > div")
+            ).map(div => div.outerHTML);
+            """
+        )
 
     def _is_next_button_visible(self) -> bool:
         try:
@@ -96,14 +231,72 @@ class PracujPLITScraper(BaseSiteScraper):
         except Exception:
             return False
 
+    # Every offer link on the page, so a pinned or promoted first offer
+    # cannot hide a page change. Empty while no offers are rendered.
+    # Kept on one line: it is inlined after "return", where a newline would end the statement.
+    OFFERS_FINGERPRINT_JS = (
+        "Array.from(document.querySelectorAll("
+        "\"[data-test='section-offers'] a[data-test='link-offer-title']\""
+        ")).map(link => link.href).join('|')"
+    )
+
+    def _offers_fingerprint(self) -> str:
+        return self.driver.execute_script(f"return {self.OFFERS_FINGERPRINT_JS};")
+
+    def _wait_for_offers_change_async(self, prev_fingerprint: str, timeout_ms: int = 5000) -> bool:
+        try:
+            return self.driver.execute_async_script(
+                f"""
+                const prev = arguments[0];
+                const cb = arguments[arguments.length - 1];
+                const changed = () => {{
+                    const fingerprint = {self.OFFERS_FINGERPRINT_JS};
+                    return fingerprint !== '' && fingerprint !== prev;
+                }};
+                if (changed()) {{
+                    cb(true);
+                    return;
+                }}
+
+                const obs = new MutationObserver(() => {{
+                    if (changed()) {{
+                        obs.disconnect();
+                        clearTimeout(timer);
+                        cb(true);
+                    }}
+                }});
+                obs.observe(document.body, {{childList: true, subtree: true}});
+                const timer = setTimeout(() => {{ obs.disconnect(); cb(changed()); }}, arguments[1]);
+                """,
+                prev_fingerprint,
+                timeout_ms,
+            )
+        except JavascriptException:
+            # A full navigation unloads the observed document - the new one
+            # only has to show its offers.
+            self.wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='section-offers'] > div"))
+            )
+            return True
+
     def _click_next_page(self) -> None:
         next_btn = self.wait.until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-test='bottom-pagination-button-next']"))
         )
+        prev_fingerprint = self._offers_fingerprint()
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
-        time.sleep(0.3)
         next_btn.click()
-        time.sleep(0.5)
+
+        # The driver runs with page_load_strategy="none", so wait for the next
+        # page's offers ourselves and stop loading ads/analytics once they appear.
+        if not self._wait_for_offers_change_async(prev_fingerprint):
+            # Slow page: keep it loading and poll a little longer. WebDriverWait
+            # raises TimeoutException if the offers still have not changed.
+            self.wait.until(
+                lambda _: self._offers_fingerprint() not in ("", prev_fingerprint),
+                "Next page offers did not load in time",
+            )
+        self.driver.execute_script("window.stop();")
 
     def scrape(
         self,
@@ -112,9 +305,15 @@ class PracujPLITScraper(BaseSiteScraper):
         with_salary: bool = True,
         max_stale_rounds: int = 5,
         max_rounds: int = 400,
-    ) -> str:
+    ) -> Iterator[str]:
         url = self._build_url(city, experience, with_salary)
-        self.driver.get(url)
+        self._open(url)
+
+        # With page_load_strategy="none" _open returns before any content exists;
+        # give the short cookie/popup waits a rendered listing to start from.
+        self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='section-offers']"))
+        )
 
         self._accept_cookies_if_present()
         self._close_popup_if_present()
@@ -126,24 +325,27 @@ class PracujPLITScraper(BaseSiteScraper):
             print("Failed to parse offer count from header.")
 
         all_offers: list[str] = []
+        seen_offers: set[str] = set()
 
         for page in range(max_rounds):
             self.wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='section-offers']"))
             )
 
-            page_offers = self._collect_offer_divs()
-            all_offers.extend(page_offers)
+            page_offers = self._add_new_offers(self._collect_offer_divs(), all_offers, seen_offers)
             print(f"Page {page + 1}: collected {len(page_offers)} offers (total: {len(all_offers)})")
 
+            if page > 0 and not page_offers:
+                print("No new offers on this page - stopping")
+                break
+
             if not self._is_next_button_visible():
                 print("No more pages - next button not visible")
                 break
 
             self._click_next_page()
 
-        merged_html = "<div>" + "".join(all_offers) + "</div>"
-        return merged_html
+        return chain(("<div>",), all_offers, ("</div>",))
 
 
 class JustJoinITScraper(BaseSiteScraper):
@@ -179,22 +381,59 @@ class JustJoinITScraper(BaseSiteScraper):
         except Exception:
             return
 
-    def _collect_visible_items(self, seen: dict[str, str]) -> None:
+    @staticmethod
+    def _store_rows(seen: dict[int, str], rows: list, last_max_idx: int) -> int:
+        # Rows only ever carry indexes above last_max_idx, so none are known yet
+        seen.update(rows)
+        return max((idx for idx, _ in rows), default=last_max_idx)
+
+    def _collect_visible_items(self, seen: dict[int, str], last_max_idx: int) -> int:
         rows = self.driver.execute_script(
             """
+            const m = arguments[0];
             return Array.from(
                 document.querySelectorAll('#up-offers-list ul li[data-index]')
-            ).map(li => ({
-                idx: li.getAttribute('data-index'),
-                html: li.outerHTML
-            }));
+            ).filter(li => +li.getAttribute('data-index') > m)
+             .map(li => [+li.dataset.index, li.outerHTML]);
+            """,
+            last_max_idx,
+        )
+
+        return self._store_rows(seen, rows, last_max_idx)
+
+    def _scroll_and_collect_async(self, seen: dict[int, str], last_max_idx: int, timeout_ms: int = 800) -> int:
+        rows = self.driver.execute_async_script(
             """
+            const m = arguments[0];
+            const cb = arguments[arguments.length - 1];
+            const collect = () => [...document.querySelectorAll('#up-offers-list ul li[data-index]')]
+                .filter(li => +li.dataset.index > m);
+            window.scrollBy(0, 1200);
+
+            const ready = collect();
+            if (ready.length) {
+                cb(ready.map(li => [+li.dataset.index, li.outerHTML]));
+                return;
+            }
+
+            // The list can be briefly re-mounted; watch the whole body until it is back
+            const target = document.querySelector('#up-offers-list') || document.body;
+            const obs = new MutationObserver(() => {
+                const rows = collect();
+                if (rows.length) {
+                    obs.disconnect();
+                    clearTimeout(timer);
+                    cb(rows.map(li => [+li.dataset.index, li.outerHTML]));
+                }
+            });
+            obs.observe(target, {childList: true, subtree: true});
+            const timer = setTimeout(() => { obs.disconnect(); cb([]); }, arguments[1]);
+            """,
+            last_max_idx,
+            timeout_ms,
         )
 
-        for row in rows:
-            idx = row["idx"]
-            if idx is not None and idx not in seen:
-                seen[idx] = row["html"]
+        return self._store_rows(seen, rows, last_max_idx)
 
     def scrape(
         self,
@@ -203,9 +442,9 @@ class JustJoinITScraper(BaseSiteScraper):
         with_salary: bool = True,
         max_stale_rounds: int = 5,
         max_rounds: int = 400,
-    ) -> str:
+    ) -> Iterator[str]:
         url = self._build_url(city, experience, with_salary)
-        self.driver.get(url)
+        self._open(url)
 
         self._accept_cookies_if_present()
 
@@ -215,80 +454,202 @@ class JustJoinITScraper(BaseSiteScraper):
         except Exception:
             print("Failed to parse offer count from header.")
 
-        seen: dict[str, str] = {}
-        self._collect_visible_items(seen)
+        self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#up-offers-list ul li[data-index]"))
+        )
 
+        seen: dict[int, str] = {}
+        last_max_idx = self._collect_visible_items(seen, -1)
         stale_rounds = 0
-        last_count = len(seen)
-        last_max_idx = max((int(k) for k in seen.keys()), default=-1)
 
         for _ in range(max_rounds):
-            self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#up-offers-list ul li[data-index]"))
-            )
-            self._collect_visible_items(seen)
-
-            current_count = len(seen)
-            current_max_idx = max((int(k) for k in seen.keys()), default=-1)
-
-            progressed = (current_count > last_count) or (current_max_idx > last_max_idx)
+            try:
+                current_max_idx = self._scroll_and_collect_async(seen, last_max_idx)
+            except (JavascriptException, TimeoutException):
+                # Async collection failed - scroll and poll instead, backing off while stale
+                self.driver.execute_script("window.scrollBy(0, 1200);")
+                time.sleep(min(0.5, 0.05 * (stale_rounds + 1)))
+                current_max_idx = self._collect_visible_items(seen, last_max_idx)
+
+            progressed = current_max_idx > last_max_idx
             stale_rounds = 0 if progressed else stale_rounds + 1
             if stale_rounds >= max_stale_rounds:
                 break
 
-            last_count = current_count
             last_max_idx = current_max_idx
 
-            self.driver.execute_script("window.scrollBy(0, 1200);")
-            time.sleep(0.35)
+        return chain(("<ul>",), (seen[k] for k in sorted(seen)), ("</ul>",))
 
-        merged_html = "<ul>" + "".join(seen[k] for k in sorted(seen, key=lambda x: int(x))) + "</ul>"
-        return merged_html
+
+def _worker(job_site: SupportedJobSites, kwargs: dict, output_dir: str, driver_config: dict) -> Path:
+    # Selenium Options are rebuilt here from plain data rather than pickled
+    options = Options()
+    for argument in driver_config["arguments"]:
+        options.add_argument(argument)
+    if not any(argument.startswith("--headless") for argument in driver_config["arguments"]):
+        options.add_argument("--headless")
+    for name, value in driver_config["experimental_options"].items():
+        options.add_experimental_option(name, value)
+    options.page_load_strategy = driver_config["page_load_strategy"]
+
+    with DataScraper(job_site, web_driver_options=options, wait_timeout=driver_config["wait_timeout"]) as scraper:
+        return scraper.scrape(output_dir=output_dir, **kwargs)
 
 
 class DataScraper:
+    MAX_WORKERS = 4
+    SCRAPER_CLASSES: dict[SupportedJobSites, type[BaseSiteScraper]] = {
+        SupportedJobSites.JUSTJOINIT: JustJoinITScraper,
+        SupportedJobSites.PRACUJPLIT: PracujPLITScraper,
+    }
+
     def __init__(
         self,
         job_site: SupportedJobSites,
         web_driver_options: Options | None = None,
         wait_timeout: int = 10,
+        headless: bool = False,
     ):
         self.job_site = job_site
+        self.wait_timeout = wait_timeout
 
         options = web_driver_options or Options()
         if web_driver_options is None:
-            # options.add_argument("--headless")
+            if headless:
+                options.add_argument("--headless")
             options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--no-sandbox")
+            # Offers are read from the DOM only, so skip images and webfonts.
+            # JS stays on - justjoin.it renders the listing client-side.
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.fonts": 2,
+            })
+            options.page_load_strategy = "none"
+        self.options = options
+
+        # Chrome is started on first use so that instances stay cheap (and
+        # picklable) until they actually scrape.
+        self.driver: webdriver.Chrome | None = None
+        self.wait: WebDriverWait | None = None
+        self._scrapers: dict[SupportedJobSites, BaseSiteScraper] = {}
+
+    def _ensure_driver(self) -> None:
+        if self.driver is not None:
+            return
 
-        self.driver = webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, wait_timeout)
+        self.driver = webdriver.Chrome(options=self.options)
+        self.driver.set_page_load_timeout(30)
+        self.driver.set_script_timeout(10)
+        self.wait = WebDriverWait(self.driver, self.wait_timeout)
 
-        self._scrapers: dict[SupportedJobSites, BaseSiteScraper] = {
-            SupportedJobSites.JUSTJOINIT: JustJoinITScraper(self.driver, self.wait),
-            SupportedJobSites.PRACUJPLIT: PracujPLITScraper(self.driver, self.wait),
+        self._scrapers = {
+            job_site: scraper_class(self.driver, self.wait)
+            for job_site, scraper_class in self.SCRAPER_CLASSES.items()
         }
 
-    def scrape(self, output_dir: str = RAW_DATA_DIR, **kwargs) -> str:
+    def _is_fresh(self, filepath: Path, max_age: timedelta | None) -> bool:
+        if not filepath.exists():
+            return False
+        if max_age is None:
+            return True
+        modified_at = datetime.fromtimestamp(filepath.stat().st_mtime)
+        return datetime.now() - modified_at <= max_age
+
+    def _scrape_in_browser(self, new_tab: bool, **kwargs) -> Iterator[str]:
+        self._ensure_driver()
         scraper = self._scrapers[self.job_site]
-        merged_html = scraper.scrape(**kwargs)
+        if not new_tab:
+            return scraper.scrape(**kwargs)
+
+        # Chunks are already collected in memory, so the tab can be closed
+        # before they are written out.
+        main_handle = self.driver.current_window_handle
+        self.driver.switch_to.new_window("tab")
+        try:
+            return scraper.scrape(**kwargs)
+        finally:
+            self.driver.close()
+            self.driver.switch_to.window(main_handle)
 
+    def scrape(
+        self,
+        output_dir: str = RAW_DATA_DIR,
+        force: bool = False,
+        max_age: timedelta | None = None,
+        new_tab: bool = False,
+        **kwargs,
+    ) -> Path:
         city = kwargs.get("city", "")
         experience = kwargs.get("experience", "")
 
-        filepath = build_data_path(output_dir, self.job_site, city, experience, "html")
+        # Output paths are dated, so an existing file means today's scrape is done.
+        # Scrapes without the salary filter get their own file so the two never mix.
+        variant = "" if kwargs.get("with_salary", True) else "nosalary"
+        filepath = build_data_path(output_dir, self.job_site, city, experience, "html", variant)
+        if not force and self._is_fresh(filepath, max_age):
+            print(f"Using cached scrape: {filepath}")
+            return filepath
+
+        # Static-first: only start Chrome when plain HTTP is not enough
+        html_chunks = self.SCRAPER_CLASSES[self.job_site].scrape_static(**kwargs)
+        if html_chunks is None:
+            html_chunks = self._scrape_in_browser(new_tab, **kwargs)
+
         with open(filepath, "w", encoding="utf-8") as file:
-            file.write(merged_html)
+            file.writelines(html_chunks)
 
         print(f"Scraping completed. Output saved to: {filepath}")
-        return merged_html
+        return filepath
+
+    def scrape_many(self, jobs: list[dict], output_dir: str = RAW_DATA_DIR) -> list[Path]:
+        """
+        Scrape several (city, experience, ...) combinations in parallel.
+
+        Each job runs in its own process with its own headless Chrome, so the
+        pool is capped at MAX_WORKERS to keep memory usage in check. Workers
+        reuse this instance's wait_timeout and the arguments, experimental
+        options and page load strategy of its Chrome options.
+        Results are returned in the same order as jobs.
+        """
+        if not jobs:
+            return []
+
+        driver_config = {
+            "arguments": list(self.options.arguments),
+            "experimental_options": dict(self.options.experimental_options),
+            "page_load_strategy": self.options.page_load_strategy,
+            "wait_timeout": self.wait_timeout,
+        }
+
+        with ProcessPoolExecutor(max_workers=min(self.MAX_WORKERS, len(jobs))) as executor:
+            futures = [
+                executor.submit(_worker, self.job_site, job, output_dir, driver_config)
+                for job in jobs
+            ]
+            return [future.result() for future in futures]
+
+    def scrape_batch(self, targets: list[dict], output_dir: str = RAW_DATA_DIR) -> list[Path]:
+        """
+        Scrape several targets sequentially in a single Chrome instance.
+
+        Targets that need the browser get a fresh tab which is closed once they
+        are scraped, avoiding a browser cold start per target. Cached and
+        statically scraped targets never start Chrome. Lighter-weight
+        alternative to scrape_many when memory matters more than wallclock.
+        """
+        return [self.scrape(output_dir=output_dir, new_tab=True, **target) for target in targets]
 
     def close(self) -> None:
-        self.driver.quit()
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
-
-    
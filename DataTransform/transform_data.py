@@ -1,9 +1,11 @@
 import csv
+import io
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from bs4 import BeautifulSoup
+from lxml import etree
 import re
 
 from config import (
@@ -14,6 +16,14 @@ from config import (
     get_latest_file,
 )
 
+# Non-ASCII characters other than letters/digits (emoji, symbols, ...).
+# Unicode \w is exactly str.isalnum() plus "_", which is ASCII anyway.
+_NON_ASCII_SYMBOLS = re.compile(r'[^\x00-\x7F\w]+')
+_MULTI_SPACE = re.compile(r' {2,}')
+# JustJoinIT cards carry no stable attribute for the company name, so match the
+# exact nesting under the offer link, compiled once and evaluated by libxml2.
+_COMPANY_NAME_XPATH = etree.XPath("(.//a/div/div/div/div/div/div/p)[1]")
+
 
 class BaseSiteTransformer(ABC):
     """Abstract base class for site-specific HTML to structured data transformers."""
@@ -28,6 +38,12 @@ class BaseSiteTransformer(ABC):
         """Return CSV column names for this transformer."""
         pass
 
+    def parse_rows(self, html_content: str) -> Iterator[tuple[str, ...]]:
+        """Yield offers as tuples ordered like get_fieldnames()."""
+        fieldnames = self.get_fieldnames()
+        for offer in self.parse(html_content):
+            yield tuple(offer[name] for name in fieldnames)
+
 
 class JustJoinITTransformer(BaseSiteTransformer):
     """Transformer for JustJoinIT job offers HTML."""
@@ -37,82 +53,84 @@ class JustJoinITTransformer(BaseSiteTransformer):
 
     def _clean_position(self, text: str) -> str:
         """Clean position text from non-ASCII characters."""
-        cleaned = ''.join(
-            char for char in text 
-            if char.isascii() or char.isalnum() or char in ' .,()-'
-        ).strip()
-        return re.sub(r' {2,}', ' ', cleaned)
-
-    def _parse_salary(self, h6_element) -> dict[str, str]:
-        """Parse salary information from h6 element."""
-        if not h6_element:
-            return {
-                "minimum": "",
-                "maximum": "",
-                "currency": "",
-                "pay_period": ""
-            }
+        cleaned = _NON_ASCII_SYMBOLS.sub('', text).strip()
+        return _MULTI_SPACE.sub(' ', cleaned)
+
+    def _get_text(self, element) -> str:
+        """Concatenate stripped text nodes of an lxml element."""
+        return "".join(part.strip() for part in element.itertext())
 
-        salary_spans = [span.get_text(strip=True) for span in h6_element.find_all("span")]
+    def _parse_salary(self, h6_element) -> tuple[str, str, str, str]:
+        """Parse salary information from h6 element as (minimum, maximum, currency, pay_period)."""
+        if h6_element is None:
+            return "", "", "", ""
+
+        salary_spans = [self._get_text(span) for span in h6_element.iter("span")]
 
         if len(salary_spans) == 2:
             minimum, currency_pay_period = salary_spans
             maximum = minimum
-            try:
-                currency, pay_period = currency_pay_period.split('/')
-            except ValueError:
-                currency, pay_period = currency_pay_period, ""
         elif len(salary_spans) >= 3:
-            minimum, maximum, currency_per_time = salary_spans[:3]
-            try:
-                currency, pay_period = currency_per_time.split('/')
-            except ValueError:
-                currency, pay_period = currency_per_time, ""
+            minimum, maximum, currency_pay_period = salary_spans[:3]
         else:
-            return {
-                "minimum": "",
-                "maximum": "",
-                "currency": "",
-                "pay_period": ""
-            }
+            return "", "", "", ""
 
-        return {
-            "minimum": minimum.replace(" ", ""),
-            "maximum": maximum.replace(" ", ""),
-            "currency": currency,
-            "pay_period": pay_period
-        }
+        currency, _, pay_period = currency_pay_period.partition('/')
+        if '/' in pay_period:
+            # Not a plain "currency/period" pair - keep it whole as currency
+            currency, pay_period = currency_pay_period, ""
+
+        return minimum.replace(" ", ""), maximum.replace(" ", ""), currency, pay_period
 
     def parse(self, html_content: str) -> list[dict[str, Any]]:
         """Parse JustJoinIT HTML and extract job offers."""
-        soup = BeautifulSoup(html_content, "lxml")
-        offers: list[dict] = []
-
-        ul = soup.find("ul")
-        if not ul:
-            return offers
-
-        for li in ul.find_all("li", recursive=False):
-            # Extract position
-            h3 = li.find("h3")
-            position_raw = h3.get_text(strip=True) if h3 else ""
-            position = self._clean_position(position_raw)
-
-            # Extract salary
-            h6 = li.find("h6")
-            salary_data = self._parse_salary(h6)
-
-            # Extract company name
-            company_p = li.select_one("a > div > div > div > div > div > div > p")
-            company_name = company_p.get_text(strip=True) if company_p else ""
-
-            offers.append({
-                "position": position,
-                "company_name": company_name,
-                **salary_data
-            })
-
-        return offers
+        fieldnames = self.get_fieldnames()
+        return [dict(zip(fieldnames, row)) for row in self.parse_rows(html_content)]
+
+    def parse_rows(self, html_content: str) -> Iterator[tuple[str, ...]]:
+        """Stream JustJoinIT offers as tuples ordered like get_fieldnames()."""
+        # An empty or truncated raw file simply has no offers
+        if not html_content.strip():
+            return
+
+        context = etree.iterparse(
+            io.BytesIO(html_content.encode("utf-8")),
+            events=("end",),
+            tag="li",
+            html=True,
+            encoding="utf-8",
+        )
+
+        try:
+            for _, li in context:
+                # Only top-level offers: <html><body><ul><li>. Nested <li> elements
+                # are handled (and freed) together with their offer.
+                parent = li.getparent()
+                grandparent = parent.getparent() if parent is not None else None
+                if parent is None or parent.tag != "ul" or grandparent is None or grandparent.tag != "body":
+                    continue
+
+                # Extract position
+                h3 = li.find(".//h3")
+                position_raw = self._get_text(h3) if h3 is not None else ""
+                position = self._clean_position(position_raw)
+
+                # Extract salary
+                h6 = li.find(".//h6")
+                salary = self._parse_salary(h6)
+
+                # Extract company name
+                company_p = _COMPANY_NAME_XPATH(li)
+                company_name = self._get_text(company_p[0]) if company_p else ""
+
+                # Free already processed offers to keep memory flat
+                li.clear()
+                while li.getprevious() is not None:
+                    del parent[0]
+
+                yield position, company_name, *salary
+        except etree.XMLSyntaxError:
+            return
 
 
 class PracujPLITTransformer(BaseSiteTransformer):
@@ -225,6 +243,18 @@ class DataTransformer:
             SupportedJobSites.PRACUJPLIT: PracujPLITTransformer(),
         }
 
+    @staticmethod
+    def _write_csv(output_path: Path, fieldnames: list[str], rows: Iterable[tuple[str, ...]]) -> int:
+        """Write header and rows to a CSV file, returning the number of rows written."""
+        offers_count = 0
+        with open(output_path, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(fieldnames)
+            for row in rows:
+                writer.writerow(row)
+                offers_count += 1
+        return offers_count
+
     def transform(
         self,
         input_path: str | Path | None = None,
@@ -264,13 +294,10 @@ class DataTransformer:
         
         input_path = Path(input_path)
 
-        # Read and parse HTML
+        # Read HTML
         with open(input_path, encoding="utf-8") as html_file:
             html_content = html_file.read()
 
-        offers = transformer.parse(html_content)
-        print(f"Parsed {len(offers)} offers from {input_path}")
-
         # Determine output path
         if city and experience:
             output_path = build_data_path(output_dir, self.job_site, city, experience, "csv")
@@ -281,12 +308,11 @@ class DataTransformer:
             ) / f"{input_path.stem}.csv"
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write CSV
-        fieldnames = transformer.get_fieldnames()
-        with open(output_path, "w", newline="", encoding="utf-8") as csv_file:
-            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(offers)
+        # Parse and write CSV in one pass
+        offers_count = self._write_csv(
+            output_path, transformer.get_fieldnames(), transformer.parse_rows(html_content)
+        )
+        print(f"Parsed {offers_count} offers from {input_path}")
 
         print(f"Transformation completed. Output saved to: {output_path}")
         return output_path
@@ -299,7 +325,10 @@ class DataTransformer:
         experience: str = "",
     ) -> tuple[list[dict], Path | None]:
         """
-        Transform HTML content directly (useful when chaining with scraper).
+        Transform HTML content that is already in memory.
+
+        To chain with DataScraper, pass the saved file instead:
+        transform(input_path=scraper.scrape(...)).
         
         Args:
             html_content: Raw HTML string to transform.
@@ -319,10 +348,8 @@ class DataTransformer:
             output_path = build_data_path(output_dir, self.job_site, city, experience, "csv")
             
             fieldnames = transformer.get_fieldnames()
-            with open(output_path, "w", newline="", encoding="utf-8") as csv_file:
-                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(offers)
+            rows = (tuple(offer[name] for name in fieldnames) for offer in offers)
+            self._write_csv(output_path, fieldnames, rows)
 
             print(f"Transformation completed. Output saved to: {output_path}")
 
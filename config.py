@@ -1,6 +1,7 @@
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
+from datetime import date
 
 
 class SupportedJobSites(Enum):
@@ -44,6 +45,7 @@ RAW_DATA_DIR = "data/raw"
 STAGING_DATA_DIR = "data/staging"
 
 
+@lru_cache(maxsize=1024)
 def get_abbreviations(job_site: SupportedJobSites, city: str, experience: str | int) -> tuple[str, str, str]:
     """Get abbreviations for site, region and experience."""
     site_abbr = SITE_ABBREVIATIONS.get(job_site, str(job_site.value)[:4])
@@ -53,9 +55,14 @@ def get_abbreviations(job_site: SupportedJobSites, city: str, experience: str |
     return site_abbr, region_abbr, exp_abbr
 
 
+@lru_cache(maxsize=1)
+def _format_day(day: date) -> str:
+    return day.strftime("%d%m%Y")
+
+
 def get_timestamp() -> str:
     """Get current timestamp in ddmmyyyy format."""
-    return datetime.now().strftime("%d%m%Y")
+    return _format_day(date.today())
 
 
 def build_data_path(
@@ -63,10 +70,12 @@ def build_data_path(
     job_site: SupportedJobSites,
     city: str,
     experience: str,
-    extension: str = "html"
+    extension: str = "html",
+    variant: str = ""
 ) -> Path:
     """
     Build data path following the structure: base_dir/site/region/experience/timestamp.extension
+    A non-empty variant is appended to the file name as timestamp_variant.extension.
     Creates directories if they don't exist.
     """
     site_abbr, region_abbr, exp_abbr = get_abbreviations(job_site, city, experience)
@@ -75,7 +84,8 @@ def build_data_path(
     output_path = Path(base_dir) / site_abbr / region_abbr / exp_abbr
     output_path.mkdir(parents=True, exist_ok=True)
 
-    return output_path / f"{timestamp}.{extension}"
+    suffix = f"_{variant}" if variant else ""
+    return output_path / f"{timestamp}{suffix}.{extension}"
 
 
 def get_latest_file(
@@ -83,10 +93,12 @@ def get_latest_file(
     job_site: SupportedJobSites,
     city: str,
     experience: str,
-    extension: str = "html"
+    extension: str = "html",
+    variant: str = ""
 ) -> Path | None:
     """
     Get the latest file from the data directory for given parameters.
+    Only files of the given variant (see build_data_path) are considered.
     Returns None if no files found.
     """
     site_abbr, region_abbr, exp_abbr = get_abbreviations(job_site, city, experience)
@@ -95,5 +107,8 @@ def get_latest_file(
     if not dir_path.exists():
         return None
 
-    files = sorted(dir_path.glob(f"*.{extension}"), reverse=True)
+    files = sorted(
+        (f for f in dir_path.glob(f"*.{extension}") if f.stem.partition("_")[2] == variant),
+        reverse=True,
+    )
     return files[0] if files else None